@@ -6,26 +6,51 @@ Monitor and manage your Gemini API gateway in real-time.
 
 import sys
 import os
+import time
 
-# Add parent directory to path FIRST
-sys.path.insert(0, os.path.abspath('.'))
+# Add parent directory to path FIRST (once - Streamlit re-executes this
+# script on every rerun, so an unconditional insert keeps growing sys.path)
+PROJECT_DIR = os.path.abspath('.')
+if PROJECT_DIR not in sys.path:
+    sys.path.insert(0, PROJECT_DIR)
 
-import json
+from collections import Counter
 from pathlib import Path
 from datetime import datetime
-from copy import deepcopy
 
+import orjson
 import pandas as pd
-import plotly.express as px
 import plotly.graph_objects as go
 import streamlit as st
 
 try:
-    from proxy.gemini_usage_tracker import get_today_usage, get_usage_range
+    from proxy.gemini_usage_tracker import (
+        HISTORY_FILE,
+        get_today_usage_bulk,
+        get_usage_range_bulk,
+    )
     TRACKER_AVAILABLE = True
 except ImportError:
     TRACKER_AVAILABLE = False
 
+# Stats file and the per-IP counter columns aggregated by the dashboard
+STATS_FILE = 'stats/request_stats.json'
+STATS_COUNT_COLUMNS = ['total_requests', 'gemini_requests', 'success_count', 'failed_count']
+
+# Attempts (and delay in seconds between them) for swapping in the saved Gemini config
+# (on Windows the replace fails while the proxy has the file open for its own write)
+CONFIG_REPLACE_ATTEMPTS = 5
+CONFIG_REPLACE_DELAY = 0.1
+
+# Emoji shown next to each config status
+STATUS_EMOJI = {
+    'healthy': '🟢',
+    'failed': '🔴',
+    'timeout': '🟠',
+    'rate_limited': '🟡',
+    'unknown': '⚪'
+}
+
 # Page config
 st.set_page_config(
     page_title="Gemini API Gateway Dashboard",
@@ -59,88 +84,327 @@ st.title("🤖 Gemini API Gateway Dashboard")
 st.markdown("Monitor and manage your Gemini API gateway in real-time")
 
 # Helper functions
-@st.cache_data(ttl=5)
+def get_file_mtime(path):
+    """Get file modification time (ns), or None if the file does not exist."""
+    try:
+        return Path(path).stat().st_mtime_ns
+    except OSError:
+        return None
+
+@st.cache_data(show_spinner=False, max_entries=6)
+def load_json_file(path, mtime_ns):
+    """Parse a JSON file (cached until its modification time changes, a few versions at most)."""
+    with open(path, 'rb') as f:
+        return orjson.loads(f.read())
+
 def load_stats():
     """Load request statistics from JSON file."""
-    stats_file = Path('stats/request_stats.json')
-    if stats_file.exists():
+    mtime_ns = get_file_mtime(STATS_FILE)
+    if mtime_ns is not None:
         try:
-            with open(stats_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            return data
+            return load_json_file(STATS_FILE, mtime_ns)
         except Exception as e:
             st.error(f"Error loading stats: {e}")
             return None
     return None
 
-@st.cache_data(ttl=5)
 def load_proxy_config():
     """Load proxy configuration."""
-    config_file = Path('proxy_config.json')
-    if config_file.exists():
+    config_file = 'proxy_config.json'
+    mtime_ns = get_file_mtime(config_file)
+    if mtime_ns is not None:
         try:
-            with open(config_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            return load_json_file(config_file, mtime_ns)
         except Exception as e:
             st.error(f"Error loading config: {e}")
             return None
     return None
 
-@st.cache_data(ttl=5)
 def load_gemini_config():
     """Load Gemini configuration."""
-    config_file = Path('gemini_config.json')
-    if config_file.exists():
+    config_file = 'gemini_config.json'
+    mtime_ns = get_file_mtime(config_file)
+    if mtime_ns is not None:
         try:
-            with open(config_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            return load_json_file(config_file, mtime_ns)
         except Exception as e:
             return None
     return None
 
+def load_gemini_configs():
+    """Load the list of Gemini configs (a fresh copy of the file's current contents)."""
+    gemini_config = load_gemini_config()
+    if not gemini_config:
+        return []
+    if isinstance(gemini_config, list):
+        return gemini_config
+    if isinstance(gemini_config, dict) and 'configs' in gemini_config:
+        return gemini_config['configs']
+    return [gemini_config]
+
 def save_gemini_config(config_data):
     """Save Gemini configuration to JSON file."""
     config_file = Path('gemini_config.json')
+    tmp_file = config_file.with_suffix('.json.tmp')
     try:
-        with open(config_file, 'w', encoding='utf-8') as f:
-            json.dump(config_data, f, indent=2)
+        data = orjson.dumps(config_data, option=orjson.OPT_INDENT_2)
+
+        # Nothing changed - skip the disk write
+        if config_file.exists() and config_file.read_bytes() == data:
+            return True
+
+        # Write to a temp file and swap it in so readers never see a partial file
+        with open(tmp_file, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+
+        for attempt in range(CONFIG_REPLACE_ATTEMPTS):
+            try:
+                os.replace(tmp_file, config_file)
+                break
+            except PermissionError:
+                if attempt == CONFIG_REPLACE_ATTEMPTS - 1:
+                    raise
+                time.sleep(CONFIG_REPLACE_DELAY)
         return True
     except Exception as e:
+        # Don't leave the temp file behind when the swap failed
+        try:
+            tmp_file.unlink(missing_ok=True)
+        except OSError:
+            pass
         st.error(f"Error saving config: {e}")
         return False
 
+@st.cache_data(max_entries=2)
+def load_stats_summary(stats_mtime):
+    """Load the summary fields of the stats file (cached on stats file mtime, without the per-IP data)."""
+    stats_data = load_stats()
+    if not stats_data:
+        return None
+
+    return {
+        'generated_at': stats_data.get('generated_at', 'Unknown'),
+        'total_ips': stats_data.get('total_ips', 0),
+        'total_requests': stats_data.get('total_requests', 0)
+    }
+
+@st.cache_data(max_entries=2)
+def load_stats_frame(stats_mtime):
+    """Load per-IP statistics as a DataFrame (cached on stats file mtime)."""
+    stats_data = load_stats()
+    if not stats_data or not stats_data.get('stats'):
+        return None
+
+    df = pd.DataFrame.from_dict(stats_data['stats'], orient='index').reindex(
+        columns=STATS_COUNT_COLUMNS + ['first_seen', 'last_seen']
+    )
+    df[STATS_COUNT_COLUMNS] = df[STATS_COUNT_COLUMNS].fillna(0).astype(int)
+    return df
+
+@st.cache_data(max_entries=2)
+def load_top_ips(stats_mtime, limit):
+    """Get request counts of the busiest IPs (cached on stats file mtime)."""
+    return load_stats_frame(stats_mtime)['total_requests'].nlargest(limit)
+
+@st.cache_data(max_entries=4)
+def build_ip_table(stats_mtime, top_n):
+    """Build the formatted top-N IP statistics table (cached on stats file mtime)."""
+    df_top = load_stats_frame(stats_mtime).nlargest(top_n, 'total_requests')
+    success_rate = df_top['success_count'] / df_top['total_requests'].clip(lower=1) * 100
+
+    return pd.DataFrame({
+        'IP Address': df_top.index,
+        'Total Requests': df_top['total_requests'],
+        'Success': df_top['success_count'],
+        'Failed': df_top['failed_count'],
+        'Success Rate': success_rate.round(1).astype(str) + '%',
+        'First Seen': df_top['first_seen'].fillna('N/A'),
+        'Last Seen': df_top['last_seen'].fillna('N/A')
+    })
+
+@st.cache_data(show_spinner=False, max_entries=2)
+def make_top_ips_figure(top_ips):
+    """Build the Top IPs bar chart (cached on the (ip, count) pairs)."""
+    ips = [ip for ip, _ in top_ips]
+    counts = [count for _, count in top_ips]
+
+    fig = go.Figure(go.Bar(
+        x=counts,
+        y=ips,
+        orientation='h',
+        marker=dict(
+            color=counts,
+            colorscale='Blues'
+        )
+    ))
+    fig.update_layout(
+        height=400,
+        showlegend=False,
+        xaxis_title='Total Requests',
+        yaxis_title='IP Address',
+        yaxis={'categoryorder': 'total ascending'}
+    )
+    return fig
+
+@st.cache_data(show_spinner=False, max_entries=2)
+def make_success_pie_figure(total_success, total_failed):
+    """Build the success vs failed pie chart (cached on the two counts)."""
+    fig = go.Figure(go.Pie(
+        labels=['Success', 'Failed'],
+        values=[total_success, total_failed],
+        marker=dict(colors=['#00CC96', '#EF553B']),
+        hole=0.4
+    ))
+    fig.update_traces(textposition='inside', textinfo='percent+label')
+    fig.update_layout(height=400)
+    return fig
+
+@st.cache_data(ttl=5)
+def load_today_usage(config_count, history_mtime):
+    """Load today's usage for all configs (cached on usage history mtime)."""
+    return get_today_usage_bulk(range(config_count))
+
+@st.cache_data(ttl=60, max_entries=2)
+def load_usage_ranges(config_count, history_mtime, days=30):
+    """Load usage for the last N days of all configs (cached on usage history mtime)."""
+    return get_usage_range_bulk(range(config_count), days=days)
+
+@st.cache_data(ttl=60, show_spinner=False, max_entries=2)
+def load_usage_trends_frame(config_count, history_mtime):
+    """Build daily successful requests per config for the last 30 days (cached on usage history mtime, up to 60s)."""
+    usage_ranges = load_usage_ranges(config_count, history_mtime, days=30)
+    trends = {
+        f"Config #{idx + 1}": {date: d['success'] for date, d in usage_data.items()}
+        for idx, usage_data in usage_ranges.items()
+        if usage_data
+    }
+    if not trends:
+        return None
+
+    # Date axis covering every day of the range, days without tracked requests count as zero
+    df = pd.DataFrame(trends)
+    df.index = pd.to_datetime(df.index)
+    days = pd.date_range(end=pd.Timestamp.now().normalize(), periods=30)
+    return df.reindex(days, fill_value=0).fillna(0).astype(int)
+
+@st.cache_data(ttl=10, show_spinner=False)
 def check_server_running():
     """Check if gateway server is running by monitoring log file activity."""
     # Check log file freshness - if log was recently modified, server is likely running
     log_file = Path('logs/proxy_server.log')
     if log_file.exists():
         try:
-            modified_time = datetime.fromtimestamp(log_file.stat().st_mtime)
-            time_diff = (datetime.now() - modified_time).total_seconds()
             # If log was modified in the last 5 minutes, server is running
-            if time_diff < 300:  # 5 minutes
+            if time.time() - log_file.stat().st_mtime < 300:  # 5 minutes
                 return True
         except:
             pass
 
     return False
 
+@st.fragment
+def add_config_fragment():
+    """Add-configuration form (reruns on its own, without the rest of the page)."""
+    with st.expander("➕ Add New Configuration", expanded=True):
+        with st.form("add_config_form"):
+            st.write("Add a new Gemini API configuration:")
+            new_api_key = st.text_input("API Key", type="password", key="new_api_key")
+            new_model = st.text_input("Model", value="gemini-2.0-flash-exp", key="new_model")
+            new_daily_limit = st.number_input("Daily Limit", min_value=1, value=1000, key="new_limit")
+
+            submitted = st.form_submit_button("Add Configuration")
+            if submitted:
+                if not new_api_key:
+                    st.error("API Key is required!")
+                else:
+                    # Create new config
+                    new_config = {
+                        "api_key": new_api_key,
+                        "model": new_model,
+                        "daily_limit": new_daily_limit,
+                        "status": "unknown"
+                    }
+
+                    # Add to the current configs list (re-read, the page's copy may be stale)
+                    configs = load_gemini_configs()
+                    configs.append(new_config)
+
+                    # Save to file
+                    save_data = {"configs": configs}
+                    if save_gemini_config(save_data):
+                        st.success("✅ Configuration added successfully!")
+                        st.rerun()
+                    else:
+                        st.error("Failed to save configuration")
+
+@st.fragment
+def edit_config_fragment():
+    """Edit/delete-configuration form (reruns on its own, without the rest of the page)."""
+    # Re-read on every fragment run, so a submit applies to the current file contents
+    configs = load_gemini_configs()
+
+    with st.expander("✏️ Edit/Delete Configuration", expanded=True):
+        if len(configs) > 0:
+            selected_config_idx = st.selectbox(
+                "Select Configuration",
+                range(len(configs)),
+                format_func=lambda x: f"Config #{x + 1} - {configs[x].get('model', 'N/A')}",
+                key="config_selector"
+            )
+
+            selected_cfg = configs[selected_config_idx]
+
+            # Use a unique form key based on selected index to force re-render
+            with st.form(f"edit_config_form_{selected_config_idx}"):
+                st.write(f"Edit Configuration #{selected_config_idx + 1}:")
+                edit_api_key = st.text_input("API Key", value=selected_cfg.get('api_key', ''))
+                edit_model = st.text_input("Model", value=selected_cfg.get('model', ''))
+                edit_daily_limit = st.number_input("Daily Limit", min_value=1, value=selected_cfg.get('daily_limit', 1000))
+
+                col_save, col_delete = st.columns(2)
+                with col_save:
+                    save_btn = st.form_submit_button("💾 Save Changes", use_container_width=True)
+                with col_delete:
+                    delete_btn = st.form_submit_button("🗑️ Delete", use_container_width=True)
+
+                if save_btn:
+                    # Preserve all existing fields and only update the ones we're editing
+                    selected_cfg.update({
+                        'api_key': edit_api_key,
+                        'model': edit_model,
+                        'daily_limit': edit_daily_limit
+                    })
+
+                    save_data = {"configs": configs}
+                    if save_gemini_config(save_data):
+                        st.success("✅ Configuration updated successfully!")
+                        st.rerun()
+                    else:
+                        st.error("Failed to save configuration")
+
+                if delete_btn:
+                    # Delete config
+                    configs.pop(selected_config_idx)
+                    save_data = {"configs": configs}
+                    if save_gemini_config(save_data):
+                        st.success("✅ Configuration deleted successfully!")
+                        st.rerun()
+                    else:
+                        st.error("Failed to delete configuration")
+        else:
+            st.info("No configurations available to edit")
+
 # Load data
-stats_data = load_stats()
+stats_mtime = get_file_mtime(STATS_FILE)
+stats_summary = load_stats_summary(stats_mtime)
+df_stats = load_stats_frame(stats_mtime)
+stats_totals = df_stats[STATS_COUNT_COLUMNS].sum() if df_stats is not None else None
 proxy_config = load_proxy_config()
-gemini_config = load_gemini_config()
 server_running = check_server_running()
 
-# Parse Gemini configs (make a deep copy to avoid modifying cached data)
-if gemini_config:
-    if isinstance(gemini_config, list):
-        configs = deepcopy(gemini_config)
-    elif isinstance(gemini_config, dict) and 'configs' in gemini_config:
-        configs = deepcopy(gemini_config['configs'])
-    else:
-        configs = [deepcopy(gemini_config)]
-else:
-    configs = []
+configs = load_gemini_configs()
 
 # ============================================================================
 # TOP METRICS
@@ -161,8 +425,8 @@ with col1:
 # Total IPs
 with col2:
     st.markdown("### Total IPs")
-    if stats_data:
-        total_ips = stats_data.get('total_ips', 0)
+    if stats_summary:
+        total_ips = stats_summary['total_ips']
         st.markdown(f"<h2>{total_ips}</h2>", unsafe_allow_html=True)
     else:
         st.markdown("<h2>0</h2>", unsafe_allow_html=True)
@@ -171,8 +435,8 @@ with col2:
 # Total Requests
 with col3:
     st.markdown("### Total Requests")
-    if stats_data:
-        total_requests = stats_data.get('total_requests', 0)
+    if stats_summary:
+        total_requests = stats_summary['total_requests']
         st.markdown(f"<h2>{total_requests:,}</h2>", unsafe_allow_html=True)
     else:
         st.markdown("<h2>0</h2>", unsafe_allow_html=True)
@@ -181,10 +445,9 @@ with col3:
 # Success Rate
 with col4:
     st.markdown("### Success Rate")
-    if stats_data and stats_data.get('stats'):
-        all_stats = stats_data['stats']
-        total_success = sum(s.get('success_count', 0) for s in all_stats.values())
-        total_failed = sum(s.get('failed_count', 0) for s in all_stats.values())
+    if stats_totals is not None:
+        total_success = int(stats_totals['success_count'])
+        total_failed = int(stats_totals['failed_count'])
         total = total_success + total_failed
         if total > 0:
             success_rate = (total_success / total) * 100
@@ -202,98 +465,109 @@ st.divider()
 # ============================================================================
 st.subheader("🤖 Gemini API Configurations")
 
-if configs:
-    # Configuration metrics
-    col_c1, col_c2, col_c3, col_c4 = st.columns(4)
-
-    with col_c1:
-        st.metric("Total Configs", len(configs))
-    with col_c2:
-        healthy = sum(1 for c in configs if c.get('status') == 'healthy')
-        st.metric("🟢 Healthy", healthy)
-    with col_c3:
-        failed = sum(1 for c in configs if c.get('status') in ['failed', 'timeout', 'rate_limited'])
-        st.metric("🔴 Failed", failed)
-    with col_c4:
-        unknown = sum(1 for c in configs if c.get('status') in ['unknown', None])
-        st.metric("⚪ Unknown", unknown)
-
-    # Today's usage if tracker available
-    if TRACKER_AVAILABLE:
-        st.markdown("**Today's Usage:**")
-
+# Unrelated reruns can skip all Gemini work when the section is hidden
+if st.toggle("Show Gemini Configurations", value=True, key='show_gemini'):
+    if configs:
+        # Status counts and today's usage in a single pass over configs
+        # (usage comes from one history read for all configs)
+        usage_today = load_today_usage(len(configs), get_file_mtime(HISTORY_FILE)) if TRACKER_AVAILABLE else None
+        status_counts = Counter()
         total_success_today = 0
         total_failed_today = 0
+        today_requests = [] if usage_today is not None else 'N/A'
 
-        for idx in range(len(configs)):
-            today_usage = get_today_usage(idx)
-            total_success_today += today_usage.get('success', 0)
-            total_failed_today += today_usage.get('failed', 0)
-
-        total_today = total_success_today + total_failed_today
-
-        col_u1, col_u2, col_u3, col_u4 = st.columns(4)
-        with col_u1:
-            st.metric("Requests Today", f"{total_today:,}")
-        with col_u2:
-            st.metric("✅ Success", f"{total_success_today:,}")
-        with col_u3:
-            st.metric("❌ Failed", f"{total_failed_today:,}")
-        with col_u4:
-            success_rate_today = (total_success_today / total_today * 100) if total_today > 0 else 0
-            st.metric("Success Rate", f"{success_rate_today:.1f}%")
-
-    # Configuration details table
-    st.markdown("**Configuration Details:**")
-    config_list = []
-    for idx, cfg in enumerate(configs):
-        status_emoji = {
-            'healthy': '🟢',
-            'failed': '🔴',
-            'timeout': '🟠',
-            'rate_limited': '🟡',
-            'unknown': '⚪'
-        }.get(cfg.get('status'), '⚪')
-
+        for idx, cfg in enumerate(configs):
+            status_counts[cfg.get('status')] += 1
+            if usage_today is not None:
+                today_usage = usage_today[idx]
+                success_today = today_usage.get('success', 0)
+                failed_today = today_usage.get('failed', 0)
+                total_success_today += success_today
+                total_failed_today += failed_today
+                today_requests.append(success_today + failed_today)
+
+        # Configuration metrics
+        col_c1, col_c2, col_c3, col_c4 = st.columns(4)
+
+        with col_c1:
+            st.metric("Total Configs", len(configs))
+        with col_c2:
+            healthy = status_counts['healthy']
+            st.metric("🟢 Healthy", healthy)
+        with col_c3:
+            failed = status_counts['failed'] + status_counts['timeout'] + status_counts['rate_limited']
+            st.metric("🔴 Failed", failed)
+        with col_c4:
+            unknown = status_counts['unknown'] + status_counts[None]
+            st.metric("⚪ Unknown", unknown)
+
+        # Today's usage if tracker available
         if TRACKER_AVAILABLE:
-            today = get_today_usage(idx)
-            today_requests = today.get('success', 0) + today.get('failed', 0)
-        else:
-            today_requests = 'N/A'
-
-        # Get API key
-        api_key = cfg.get('api_key', '')
-        api_key_display = f"***{api_key[-8:]}" if api_key and len(api_key) > 8 else 'N/A'
-
-        # Get error message
-        error_msg = cfg.get('error_message', '')
-        error_display = error_msg if error_msg else '-'
+            st.markdown("**Today's Usage:**")
+
+            total_today = total_success_today + total_failed_today
+
+            col_u1, col_u2, col_u3, col_u4 = st.columns(4)
+            with col_u1:
+                st.metric("Requests Today", f"{total_today:,}")
+            with col_u2:
+                st.metric("✅ Success", f"{total_success_today:,}")
+            with col_u3:
+                st.metric("❌ Failed", f"{total_failed_today:,}")
+            with col_u4:
+                success_rate_today = (total_success_today / total_today * 100) if total_today > 0 else 0
+                st.metric("Success Rate", f"{success_rate_today:.1f}%")
+
+        # Configuration details table
+        st.markdown("**Configuration Details:**")
+        df_cfg = pd.DataFrame(
+            configs,
+            columns=['status', 'model', 'daily_limit', 'api_key', 'error_message'],
+            dtype=object
+        )
+        api_keys = df_cfg['api_key'].fillna('').astype(str)
 
-        config_list.append({
-            'ID': f"#{idx + 1}",
-            'Status': f"{status_emoji} {cfg.get('status', 'unknown')}",
-            'Model': cfg.get('model', 'N/A'),
-            'Daily Limit': cfg.get('daily_limit', 'N/A'),
+        df_configs = pd.DataFrame({
+            'ID': '#' + pd.Series(range(1, len(configs) + 1)).astype(str),
+            'Status': df_cfg['status'].map(STATUS_EMOJI).fillna('⚪') + ' ' + df_cfg['status'].fillna('unknown').astype(str),
+            'Model': df_cfg['model'].fillna('N/A'),
+            'Daily Limit': df_cfg['daily_limit'].fillna('N/A'),
             'Today Requests': today_requests,
-            'API Key': api_key_display,
-            'Error Message': error_display
+            'API Key': ('***' + api_keys.str[-8:]).where(api_keys.str.len() > 8, 'N/A'),
+            'Error Message': df_cfg['error_message'].fillna('').replace('', '-')
         })
+        st.dataframe(df_configs, width='stretch', hide_index=True)
+
+        # Configuration Management
+        st.markdown("**Manage Configurations:**")
+
+        col_add, col_edit = st.columns(2)
 
-    df_configs = pd.DataFrame(config_list)
-    st.dataframe(df_configs, width='stretch', hide_index=True)
+        with col_add:
+            add_config_fragment()
 
-    # Configuration Management
-    st.markdown("**Manage Configurations:**")
+        with col_edit:
+            edit_config_fragment()
 
-    col_add, col_edit = st.columns(2)
+        # Usage trends chart (figure is only built once the user asks for it)
+        if TRACKER_AVAILABLE:
+            with st.expander("📈 Usage Trends (Last 30 Days)", expanded=False):
+                if st.checkbox("Show usage trends chart", key="show_trends"):
+                    df_trends = load_usage_trends_frame(len(configs), get_file_mtime(HISTORY_FILE))
+                    if df_trends is not None:
+                        st.line_chart(df_trends, x_label="Date", y_label="Successful Requests", height=400)
+                    else:
+                        st.info("No usage data available yet")
+
+    else:
+        st.info("Gemini API not configured. Add your first configuration below:")
 
-    with col_add:
-        with st.expander("➕ Add New Configuration", expanded=True):
-            with st.form("add_config_form"):
+        with st.expander("➕ Add First Configuration", expanded=True):
+            with st.form("add_first_config_form"):
                 st.write("Add a new Gemini API configuration:")
-                new_api_key = st.text_input("API Key", type="password", key="new_api_key")
-                new_model = st.text_input("Model", value="gemini-2.0-flash-exp", key="new_model")
-                new_daily_limit = st.number_input("Daily Limit", min_value=1, value=1000, key="new_limit")
+                new_api_key = st.text_input("API Key", type="password", key="first_api_key")
+                new_model = st.text_input("Model", value="gemini-2.0-flash-exp", key="first_model")
+                new_daily_limit = st.number_input("Daily Limit", min_value=1, value=1000, key="first_limit")
 
                 submitted = st.form_submit_button("Add Configuration")
                 if submitted:
@@ -308,140 +582,14 @@ if configs:
                             "status": "unknown"
                         }
 
-                        # Add to configs list
-                        configs.append(new_config)
-
-                        # Save to file
-                        save_data = {"configs": configs}
+                        # Save to file (keeping any config added elsewhere meanwhile)
+                        save_data = {"configs": load_gemini_configs() + [new_config]}
                         if save_gemini_config(save_data):
                             st.success("✅ Configuration added successfully!")
-                            st.cache_data.clear()
-                            st.rerun()
-                        else:
-                            st.error("Failed to save configuration")
-
-    with col_edit:
-        with st.expander("✏️ Edit/Delete Configuration", expanded=True):
-            if len(configs) > 0:
-                config_options = [f"Config #{i+1} - {cfg.get('model', 'N/A')}" for i, cfg in enumerate(configs)]
-                selected_config_idx = st.selectbox("Select Configuration", range(len(configs)), format_func=lambda x: config_options[x], key="config_selector")
-
-                selected_cfg = configs[selected_config_idx]
-
-                # Use a unique form key based on selected index to force re-render
-                with st.form(f"edit_config_form_{selected_config_idx}"):
-                    st.write(f"Edit Configuration #{selected_config_idx + 1}:")
-                    edit_api_key = st.text_input("API Key", value=selected_cfg.get('api_key', ''))
-                    edit_model = st.text_input("Model", value=selected_cfg.get('model', ''))
-                    edit_daily_limit = st.number_input("Daily Limit", min_value=1, value=selected_cfg.get('daily_limit', 1000))
-
-                    col_save, col_delete = st.columns(2)
-                    with col_save:
-                        save_btn = st.form_submit_button("💾 Save Changes", use_container_width=True)
-                    with col_delete:
-                        delete_btn = st.form_submit_button("🗑️ Delete", use_container_width=True)
-
-                    if save_btn:
-                        # Preserve all existing fields and only update the ones we're editing
-                        updated_config = deepcopy(selected_cfg)
-
-                        # Update fields
-                        updated_config['api_key'] = edit_api_key
-                        updated_config['model'] = edit_model
-                        updated_config['daily_limit'] = edit_daily_limit
-
-                        configs[selected_config_idx] = updated_config
-
-                        save_data = {"configs": configs}
-                        if save_gemini_config(save_data):
-                            st.success("✅ Configuration updated successfully!")
-                            st.cache_data.clear()
                             st.rerun()
                         else:
                             st.error("Failed to save configuration")
 
-                    if delete_btn:
-                        # Delete config
-                        configs.pop(selected_config_idx)
-                        save_data = {"configs": configs}
-                        if save_gemini_config(save_data):
-                            st.success("✅ Configuration deleted successfully!")
-                            st.cache_data.clear()
-                            st.rerun()
-                        else:
-                            st.error("Failed to delete configuration")
-            else:
-                st.info("No configurations available to edit")
-
-    # Usage trends chart
-    if TRACKER_AVAILABLE:
-        st.markdown("**Usage Trends (Last 30 Days):**")
-
-        all_lines_data = {}
-        for idx, cfg in enumerate(configs):
-            usage_data = get_usage_range(idx, days=30)
-            if usage_data:
-                all_lines_data[f"Config #{idx + 1}"] = usage_data
-
-        if all_lines_data:
-            fig = go.Figure()
-
-            for config_name, usage_data in all_lines_data.items():
-                dates = list(usage_data.keys())
-                success_counts = [d['success'] for d in usage_data.values()]
-
-                fig.add_trace(go.Scatter(
-                    name=config_name,
-                    x=dates,
-                    y=success_counts,
-                    mode='lines+markers',
-                    line=dict(width=2),
-                    marker=dict(size=6)
-                ))
-
-            fig.update_layout(
-                xaxis_title="Date",
-                yaxis_title="Successful Requests",
-                height=400,
-                hovermode='x unified'
-            )
-
-            st.plotly_chart(fig)
-        else:
-            st.info("No usage data available yet")
-
-else:
-    st.info("Gemini API not configured. Add your first configuration below:")
-
-    with st.expander("➕ Add First Configuration", expanded=True):
-        with st.form("add_first_config_form"):
-            st.write("Add a new Gemini API configuration:")
-            new_api_key = st.text_input("API Key", type="password", key="first_api_key")
-            new_model = st.text_input("Model", value="gemini-2.0-flash-exp", key="first_model")
-            new_daily_limit = st.number_input("Daily Limit", min_value=1, value=1000, key="first_limit")
-
-            submitted = st.form_submit_button("Add Configuration")
-            if submitted:
-                if not new_api_key:
-                    st.error("API Key is required!")
-                else:
-                    # Create new config
-                    new_config = {
-                        "api_key": new_api_key,
-                        "model": new_model,
-                        "daily_limit": new_daily_limit,
-                        "status": "unknown"
-                    }
-
-                    # Save to file
-                    save_data = {"configs": [new_config]}
-                    if save_gemini_config(save_data):
-                        st.success("✅ Configuration added successfully!")
-                        st.cache_data.clear()
-                        st.rerun()
-                    else:
-                        st.error("Failed to save configuration")
-
 st.divider()
 
 # ============================================================================
@@ -449,84 +597,40 @@ st.divider()
 # ============================================================================
 st.subheader("📊 Request Statistics")
 
-if stats_data and stats_data.get('stats'):
-    all_stats = stats_data['stats']
-
-    # Top 10 IPs chart
-    col_chart1, col_chart2 = st.columns(2)
-
-    with col_chart1:
-        st.markdown("**Top 10 IPs by Request Count:**")
-        top_ips = sorted(
-            all_stats.items(),
-            key=lambda x: x[1].get('total_requests', 0),
-            reverse=True
-        )[:10]
-
-        if top_ips:
-            top_ips_data = {
-                'IP Address': [ip for ip, _ in top_ips],
-                'Total Requests': [stats.get('total_requests', 0) for _, stats in top_ips]
-            }
-            df_top_ips = pd.DataFrame(top_ips_data)
-
-            fig_bar = px.bar(
-                df_top_ips,
-                x='Total Requests',
-                y='IP Address',
-                orientation='h',
-                color='Total Requests',
-                color_continuous_scale='Blues'
-            )
-            fig_bar.update_layout(
-                height=400,
-                showlegend=False,
-                yaxis={'categoryorder': 'total ascending'}
-            )
-            st.plotly_chart(fig_bar)
-        else:
-            st.info("No IP data available")
-
-    with col_chart2:
-        st.markdown("**Success vs Failed Requests:**")
-        total_success = sum(s.get('success_count', 0) for s in all_stats.values())
-        total_failed = sum(s.get('failed_count', 0) for s in all_stats.values())
-
-        success_data = {
-            'Status': ['Success', 'Failed'],
-            'Count': [total_success, total_failed]
-        }
-        df_success = pd.DataFrame(success_data)
-
-        fig_pie = px.pie(
-            df_success,
-            values='Count',
-            names='Status',
-            color='Status',
-            color_discrete_map={'Success': '#00CC96', 'Failed': '#EF553B'},
-            hole=0.4
-        )
-        fig_pie.update_traces(textposition='inside', textinfo='percent+label')
-        fig_pie.update_layout(height=400)
-        st.plotly_chart(fig_pie)
+if df_stats is not None:
+    # Top 10 IPs / success charts (figures are only built once the user asks for them)
+    with st.expander("📊 Request Charts", expanded=False):
+        if st.checkbox("Show request charts", key="show_stats_charts"):
+            col_chart1, col_chart2 = st.columns(2)
+
+            with col_chart1:
+                st.markdown("**Top 10 IPs by Request Count:**")
+                top_ips = load_top_ips(stats_mtime, 10)
+
+                if not top_ips.empty:
+                    fig_bar = make_top_ips_figure(tuple(top_ips.items()))
+                    st.plotly_chart(fig_bar)
+                else:
+                    st.info("No IP data available")
+
+            with col_chart2:
+                st.markdown("**Success vs Failed Requests:**")
+                total_success = int(stats_totals['success_count'])
+                total_failed = int(stats_totals['failed_count'])
+
+                fig_pie = make_success_pie_figure(total_success, total_failed)
+                st.plotly_chart(fig_pie)
 
     # Detailed IP Statistics Table
     st.markdown("**Detailed IP Statistics:**")
 
-    ip_list = []
-    for ip, stats in all_stats.items():
-        ip_list.append({
-            'IP Address': ip,
-            'Total Requests': stats.get('total_requests', 0),
-            'Success': stats.get('success_count', 0),
-            'Failed': stats.get('failed_count', 0),
-            'Success Rate': f"{(stats.get('success_count', 0) / stats.get('total_requests', 1) * 100):.1f}%",
-            'First Seen': stats.get('first_seen', 'N/A'),
-            'Last Seen': stats.get('last_seen', 'N/A')
-        })
-
-    df_ips = pd.DataFrame(ip_list)
-    df_ips = df_ips.sort_values('Total Requests', ascending=False)
+    # Only the top N rows are formatted and sent to the browser
+    ip_count = len(df_stats)
+    if ip_count > 10:
+        top_n = st.slider("Show top N IPs", min_value=10, max_value=min(500, ip_count), value=min(50, ip_count))
+    else:
+        top_n = ip_count
+    df_ips = build_ip_table(stats_mtime, top_n)
 
     st.dataframe(df_ips, width='stretch', hide_index=True)
 
@@ -549,9 +653,9 @@ with col_sys1:
         st.write(f"- Log Level: `{proxy_config.get('log_level', 'N/A')}`")
 
 with col_sys2:
-    if stats_data:
+    if stats_summary:
         st.write("**Statistics:**")
-        generated_at = stats_data.get('generated_at', 'Unknown')
+        generated_at = stats_summary['generated_at']
         if generated_at != 'Unknown':
             try:
                 dt = datetime.fromisoformat(generated_at)
@@ -559,8 +663,8 @@ with col_sys2:
             except:
                 pass
         st.write(f"- Last Updated: `{generated_at}`")
-        st.write(f"- Total IPs: `{stats_data.get('total_ips', 0)}`")
-        st.write(f"- Total Requests: `{stats_data.get('total_requests', 0):,}`")
+        st.write(f"- Total IPs: `{stats_summary['total_ips']}`")
+        st.write(f"- Total Requests: `{stats_summary['total_requests']:,}`")
 
 with col_sys3:
     st.write("**Quick Actions:**")
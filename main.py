@@ -3,13 +3,17 @@
 Simple Python Proxy Server - Portable Version
 """
 
+import os
 import sys
-import json
 import asyncio
 from pathlib import Path
+
+import orjson
+
 from proxy.logger import setup_logger
 from proxy.server import ProxyServer
 from proxy.request_stats import get_request_stats
+from proxy.gemini_handler import close_http_client
 
 
 class SimpleConfig:
@@ -26,41 +30,50 @@ class SimpleConfig:
         'log_dir': 'logs',
         'enable_file_logging': True,
         'stats_dir': 'stats',
-        'stats_auto_save_interval': 60
+        'stats_auto_save_interval': 60,
+        'tcp_nodelay': True
     }
 
-    def __init__(self, config_file=None):
-        """Load configuration from JSON file."""
+    def __init__(self, config_file=None, create_if_missing=True):
+        """
+        Load configuration from JSON file.
+
+        Args:
+            config_file (str, optional): Path to config file (default: proxy_config.json)
+            create_if_missing (bool): Write a default config file if none exists
+        """
         config_path = Path(config_file or self.CONFIG_FILE)
 
         # Load from file or use defaults
         if config_path.exists():
             try:
-                with open(config_path, 'r', encoding='utf-8') as f:
-                    config_data = json.load(f)
+                with open(config_path, 'rb') as f:
+                    config_data = orjson.loads(f.read())
                 print(f"Configuration loaded from {config_path}")
             except Exception as e:
                 print(f"Error loading config file: {e}, using defaults")
                 config_data = {}
         else:
-            print(f"Config file not found, creating {config_path} with defaults")
             config_data = self.DEFAULTS
-            # Create default config file
-            try:
-                with open(config_path, 'w', encoding='utf-8') as f:
-                    json.dump(self.DEFAULTS, f, indent=2)
-            except Exception as e:
-                print(f"Error creating config file: {e}")
-
-        # Set attributes with defaults as fallback
-        self.host = config_data.get('host', self.DEFAULTS['host'])
-        self.port = config_data.get('port', self.DEFAULTS['port'])
-        self.max_connections = config_data.get('max_connections', self.DEFAULTS['max_connections'])
-        self.log_level = config_data.get('log_level', self.DEFAULTS['log_level'])
-        self.log_dir = config_data.get('log_dir', self.DEFAULTS['log_dir'])
-        self.enable_file_logging = config_data.get('enable_file_logging', self.DEFAULTS['enable_file_logging'])
-        self.stats_dir = config_data.get('stats_dir', self.DEFAULTS['stats_dir'])
-        self.stats_auto_save_interval = config_data.get('stats_auto_save_interval', self.DEFAULTS['stats_auto_save_interval'])
+            if create_if_missing:
+                print(f"Config file not found, creating {config_path} with defaults")
+                self._write_defaults(config_path)
+            else:
+                print("Config file not found, using defaults")
+
+        # Set attributes, falling back to defaults for missing keys
+        for key, default in self.DEFAULTS.items():
+            setattr(self, key, config_data.get(key, default))
+
+    def _write_defaults(self, config_path):
+        """Create the default config file atomically (temp file + rename)."""
+        tmp_path = config_path.with_name(config_path.name + '.tmp')
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(orjson.dumps(self.DEFAULTS, option=orjson.OPT_INDENT_2))
+            os.replace(tmp_path, config_path)
+        except Exception as e:
+            print(f"Error creating config file: {e}")
 
     def __str__(self):
         return (f"Proxy Server Starting:\n"
@@ -95,17 +108,36 @@ async def async_main():
         logger.info("Server stopped by user")
         await proxy_server.stop()
         await stats.stop()
+        await close_http_client()
     except Exception as e:
         logger.error(f"Error: {e}")
         await proxy_server.stop()
         await stats.stop()
+        await close_http_client()
         return 1
 
     return 0
 
 
+def _use_uvloop():
+    """Use uvloop as the asyncio event loop if it is installed (not available on Windows)."""
+    if sys.platform == 'win32':
+        return False
+
+    try:
+        import uvloop
+    except ImportError:
+        return False
+
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return True
+
+
 def main():
     """Main entry point wrapper."""
+    if _use_uvloop():
+        print("Using uvloop event loop")
+
     try:
         return asyncio.run(async_main())
     except KeyboardInterrupt:
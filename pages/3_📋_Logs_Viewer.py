@@ -4,12 +4,36 @@ Logs Viewer Page - View and Search Log Files
 Browse, search, and filter proxy server log files.
 """
 
+import io
+import os
 import re
 from datetime import datetime
+from fnmatch import fnmatch
+from functools import lru_cache
 from pathlib import Path
 
 import streamlit as st
 
+# Block size used when reading log tails backwards from the end of the file
+TAIL_BLOCK_SIZE = 64 * 1024
+
+# Number of highlighted log lines rendered per page
+LOG_PAGE_SIZE = 200
+
+# Log level marker in a log line, its highlight color and the prebuilt replacement markup
+LOG_LEVEL_PATTERN = re.compile(r" - (DEBUG|INFO|WARNING|ERROR|CRITICAL) - ")
+LOG_LEVEL_COLORS = {
+    'DEBUG': '#888888',
+    'INFO': '#0066ff',
+    'WARNING': '#ff9900',
+    'ERROR': '#ff0000',
+    'CRITICAL': '#cc0000'
+}
+LOG_LEVEL_MARKUP = {
+    level: f" - <span style='color: {color}; font-weight: bold;'>{level}</span> - "
+    for level, color in LOG_LEVEL_COLORS.items()
+}
+
 st.set_page_config(
     page_title="Logs Viewer - Proxy Dashboard",
     page_icon="📋",
@@ -27,22 +51,27 @@ def get_log_files():
     if not logs_dir.exists():
         return []
 
-    log_files = sorted(
-        logs_dir.glob('*.log*'),
-        key=lambda x: x.stat().st_mtime,
-        reverse=True
-    )
-    return log_files
+    # scandir entries carry their stat info (free on Windows), no separate stat() per file
+    with os.scandir(logs_dir) as entries:
+        log_entries = [
+            (entry.path, entry.stat().st_mtime)
+            for entry in entries
+            if fnmatch(entry.name, '*.log*') and entry.is_file()
+        ]
+
+    log_entries.sort(key=lambda x: x[1], reverse=True)
+    return [Path(path) for path, _ in log_entries]
 
-def read_log_file(file_path, max_lines=None, from_end=False):
-    """Read log file content."""
+@st.cache_data(show_spinner=False, max_entries=8)
+def read_log_file(file_path, mtime_ns, max_lines=None, from_end=False):
+    """Read log file content (cached on file mtime)."""
     try:
+        if from_end and max_lines:
+            # Read last N lines
+            return read_log_tail(file_path, max_lines)
+
         with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
-            if from_end and max_lines:
-                # Read last N lines
-                lines = f.readlines()
-                return lines[-max_lines:]
-            elif max_lines:
+            if max_lines:
                 # Read first N lines
                 lines = []
                 for i, line in enumerate(f):
@@ -57,25 +86,51 @@ def read_log_file(file_path, max_lines=None, from_end=False):
         st.error(f"Error reading log file: {e}")
         return []
 
+def read_log_tail(file_path, max_lines):
+    """Read the last N lines of a log file by reading blocks backwards from the end."""
+    with open(file_path, 'rb') as f:
+        pos = f.seek(0, os.SEEK_END)
+        blocks = []
+        newline_count = 0
+
+        # Stop once there is one more newline than needed (the first line may be partial)
+        while pos > 0 and newline_count <= max_lines:
+            read_size = min(TAIL_BLOCK_SIZE, pos)
+            pos -= read_size
+            f.seek(pos)
+            block = f.read(read_size)
+            blocks.append(block)
+            newline_count += block.count(b'\n')
+
+    data = b''.join(reversed(blocks)).decode('utf-8', errors='replace')
+    # Universal newlines, same as reading the file in text mode
+    lines = io.StringIO(data, newline=None).readlines()
+    return lines[-max_lines:]
+
+@st.cache_data(show_spinner=False, max_entries=1)
+def read_log_bytes(file_path, mtime_ns, size):
+    """Read a whole log file as bytes (cached on file mtime and size, one file at a time)."""
+    return Path(file_path).read_bytes()
+
 def filter_logs(lines, log_level=None, keyword=None):
     """Filter log lines by level and keyword."""
-    filtered = []
+    patterns = []
 
-    for line in lines:
-        # Filter by log level
-        if log_level and log_level != "ALL":
-            if f" - {log_level} - " not in line:
-                continue
+    # Filter by log level
+    if log_level and log_level != "ALL":
+        patterns.append(re.compile(re.escape(f" - {log_level} - ")))
 
-        # Filter by keyword
-        if keyword:
-            if keyword.lower() not in line.lower():
-                continue
+    # Filter by keyword (case-insensitive)
+    if keyword:
+        patterns.append(re.compile(re.escape(keyword), re.IGNORECASE))
 
-        filtered.append(line)
+    filtered = list(lines)
+    for pattern in patterns:
+        filtered = [line for line in filtered if pattern.search(line)]
 
     return filtered
 
+@lru_cache(maxsize=256)
 def format_file_size(size_bytes):
     """Format file size in human-readable format."""
     for unit in ['B', 'KB', 'MB', 'GB']:
@@ -84,19 +139,35 @@ def format_file_size(size_bytes):
         size_bytes /= 1024.0
     return f"{size_bytes:.2f} TB"
 
-def highlight_log_level(line):
-    """Add color highlighting to log levels."""
-    if " - DEBUG - " in line:
-        return line.replace(" - DEBUG - ", " - <span style='color: #888888; font-weight: bold;'>DEBUG</span> - ")
-    elif " - INFO - " in line:
-        return line.replace(" - INFO - ", " - <span style='color: #0066ff; font-weight: bold;'>INFO</span> - ")
-    elif " - WARNING - " in line:
-        return line.replace(" - WARNING - ", " - <span style='color: #ff9900; font-weight: bold;'>WARNING</span> - ")
-    elif " - ERROR - " in line:
-        return line.replace(" - ERROR - ", " - <span style='color: #ff0000; font-weight: bold;'>ERROR</span> - ")
-    elif " - CRITICAL - " in line:
-        return line.replace(" - CRITICAL - ", " - <span style='color: #cc0000; font-weight: bold;'>CRITICAL</span> - ")
-    return line
+def highlight_log_level(text):
+    """Add color highlighting to log levels (works on a single line or joined lines)."""
+    return LOG_LEVEL_PATTERN.sub(lambda m: LOG_LEVEL_MARKUP[m.group(1)], text)
+
+@st.fragment
+def render_highlighted_logs(lines, newest_first=False):
+    """Render one page of highlighted log lines (paging reruns only this fragment)."""
+    page_count = max(1, -(-len(lines) // LOG_PAGE_SIZE))
+    if page_count > 1:
+        label = f"Page (1-{page_count}, newest first)" if newest_first else f"Page (1-{page_count})"
+        page = st.number_input(label, min_value=1, max_value=page_count, value=1)
+    else:
+        page = 1
+
+    if newest_first:
+        # Page 1 holds the last lines of the file (still shown oldest to newest)
+        end = len(lines) - (page - 1) * LOG_PAGE_SIZE
+        start = max(0, end - LOG_PAGE_SIZE)
+    else:
+        start = (page - 1) * LOG_PAGE_SIZE
+        end = start + LOG_PAGE_SIZE
+    highlighted_content = highlight_log_level("".join(lines[start:end]))
+
+    st.markdown(
+        f'<div style="background-color: #f0f2f6; padding: 15px; border-radius: 5px; '
+        f'font-family: monospace; font-size: 12px; height: 600px; overflow-y: scroll; white-space: pre-wrap;">'
+        f'{highlighted_content}</div>',
+        unsafe_allow_html=True
+    )
 
 # Get log files
 log_files = get_log_files()
@@ -167,7 +238,7 @@ else:
 st.divider()
 
 # Read and filter logs
-log_lines = read_log_file(selected_file, max_lines=max_lines, from_end=from_end)
+log_lines = read_log_file(str(selected_file), file_stat.st_mtime_ns, max_lines=max_lines, from_end=from_end)
 
 # Apply filters
 filtered_lines = filter_logs(log_lines, log_level if log_level != "ALL" else None, keyword if keyword else None)
@@ -200,18 +271,8 @@ if filtered_lines:
         show_highlighting = st.checkbox("Syntax Highlighting", value=True)
 
     if show_highlighting:
-        # Display with HTML highlighting
-        highlighted_content = ""
-        for line in filtered_lines:
-            highlighted_line = highlight_log_level(line)
-            highlighted_content += highlighted_line
-
-        st.markdown(
-            f'<div style="background-color: #f0f2f6; padding: 15px; border-radius: 5px; '
-            f'font-family: monospace; font-size: 12px; height: 600px; overflow-y: scroll; white-space: pre-wrap;">'
-            f'{highlighted_content}</div>',
-            unsafe_allow_html=True
-        )
+        # Display with HTML highlighting, one page at a time
+        render_highlighted_logs(filtered_lines, newest_first=from_end)
     else:
         # Display as plain text
         st.text_area(
@@ -237,11 +298,9 @@ if filtered_lines:
 
     with col_action2:
         # Download original file
-        with open(selected_file, 'r', encoding='utf-8', errors='replace') as f:
-            original_content = f.read()
         st.download_button(
             label="📥 Download Original",
-            data=original_content,
+            data=read_log_bytes(str(selected_file), file_stat.st_mtime_ns, file_stat.st_size),
             file_name=selected_file.name,
             mime="text/plain",
             width='stretch'
@@ -294,7 +294,7 @@ class GeminiConfig:
                     try:
                         from proxy.logger import get_logger
                         logger = get_logger()
-                        logger.warning(f"Could not read config file for merge: {read_error}, using in-memory config")
+                        logger.warning("Could not read config file for merge: %s, using in-memory config", read_error)
                     except:
                         print(f"WARNING: Could not read config file for merge: {read_error}")
                     file_configs = []
@@ -333,7 +333,7 @@ class GeminiConfig:
             try:
                 from proxy.logger import get_logger
                 logger = get_logger()
-                logger.debug(f"Config status saved to {save_path}")
+                logger.debug("Config status saved to %s", save_path)
             except:
                 pass
 
@@ -343,7 +343,7 @@ class GeminiConfig:
             try:
                 from proxy.logger import get_logger
                 logger = get_logger()
-                logger.error(f"Error saving config to file: {e}")
+                logger.error("Error saving config to file: %s", e)
             except:
                 print(f"Error saving config to file: {e}")
             return False
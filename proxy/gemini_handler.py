@@ -6,8 +6,6 @@ This module handles requests to the Gemini API proxy.
 
 import re
 import json
-import asyncio
-from urllib.parse import urlencode
 
 from proxy.logger import get_logger
 from proxy.gemini_config import get_gemini_config
@@ -15,6 +13,20 @@ from proxy.gemini_usage_tracker import track_request
 
 logger = get_logger()
 
+# Upstream HTTP settings
+UPSTREAM_TIMEOUT = 60.0  # seconds
+UPSTREAM_MAX_CONNECTIONS = 500
+UPSTREAM_MAX_KEEPALIVE = 100
+
+# HTTP request line: method, target and (optional) version, matched on raw bytes
+REQUEST_LINE_PATTERN = re.compile(rb'([^ \r\n]+) ([^ \r\n]+)(?: ([^\r\n]*))?')
+
+# "Name: value" header line (value without surrounding whitespace)
+HEADER_PATTERN = re.compile(r'^([^:\r\n]+):[ \t]*(.*?)[ \t]*\r?$', re.MULTILINE)
+
+# Shared upstream HTTP client (created on first use)
+_http_client = None
+
 
 def is_gemini_request(request_data):
     """
@@ -27,21 +39,13 @@ def is_gemini_request(request_data):
         bool: True if this is a Gemini API request
     """
     try:
-        request_str = request_data.decode('utf-8', errors='replace')
-        request_lines = request_str.split('\r\n')
-
-        if not request_lines:
+        # Only the request line is matched, the rest of the request is not decoded or split
+        match = REQUEST_LINE_PATTERN.match(request_data)
+        if not match:
             return False
 
-        # Parse request line
-        parts = request_lines[0].split(' ', 2)
-        if len(parts) < 2:
-            return False
-
-        method, path = parts[0], parts[1]
-
         # Check if path starts with /v1beta/ (Gemini API path)
-        return path.startswith('/v1beta/')
+        return match.group(2).startswith(b'/v1beta/')
 
     except Exception:
         return False
@@ -62,7 +66,7 @@ async def handle_gemini_request(writer, request_data, client_address):
     config = get_gemini_config()
 
     if not config.is_enabled():
-        logger.warning(f"LLM proxy request from {client_address[0]} but feature is disabled")
+        logger.warning("LLM proxy request from %s but feature is disabled", client_address[0])
         error_response = _create_error_response(
             400,
             "Bad Request",
@@ -77,13 +81,13 @@ async def handle_gemini_request(writer, request_data, client_address):
         method, path, headers, body = _parse_gemini_request(request_data)
 
         if not path:
-            logger.error(f"Could not parse LLM request from {client_address[0]}")
+            logger.error("Could not parse LLM request from %s", client_address[0])
             error_response = _create_error_response(400, "Bad Request", "Invalid request format")
             writer.write(error_response)
             await writer.drain()
             return False
 
-        logger.info(f"LLM API request from {client_address[0]}: {method} {path}")
+        logger.info("LLM API request from %s: %s %s", client_address[0], method, path)
 
         # Replace model in path with configured model
         path = _replace_model_in_path(path, config.get_model())
@@ -103,7 +107,7 @@ async def handle_gemini_request(writer, request_data, client_address):
             return False
 
     except Exception as e:
-        logger.error(f"Error handling LLM request: {e}")
+        logger.error("Error handling LLM request: %s", e)
         error_response = _create_error_response(500, "Internal Server Error", "Internal server error")
         writer.write(error_response)
         await writer.drain()
@@ -121,33 +125,27 @@ def _parse_gemini_request(request_data):
         tuple: (method, path, headers, body)
     """
     try:
-        request_str = request_data.decode('utf-8', errors='replace')
-        request_lines = request_str.split('\r\n')
-
         # Parse request line
-        method, path, _ = request_lines[0].split(' ', 2)
-
-        # Parse headers
-        headers = {}
-        body_start = 0
-        for i, line in enumerate(request_lines[1:], 1):
-            if not line:
-                body_start = i + 1
-                break
-            if ':' in line:
-                key, value = line.split(':', 1)
-                headers[key.strip()] = value.strip()
-
-        # Get body if present
-        body = b''
-        if body_start > 0:
-            body_lines = request_lines[body_start:]
-            body = '\r\n'.join(body_lines).encode('utf-8')
+        match = REQUEST_LINE_PATTERN.match(request_data)
+        if not match or match.group(3) is None:
+            raise ValueError("malformed request line")
+        method = match.group(1).decode('utf-8', errors='replace')
+        path = match.group(2).decode('utf-8', errors='replace')
+
+        # Split off the body without decoding it
+        head, _, body = request_data.partition(b'\r\n\r\n')
+        _, _, header_block = head.partition(b'\r\n')
+
+        # Parse headers (one regex scan over the header block)
+        headers = {
+            key.strip(): value
+            for key, value in HEADER_PATTERN.findall(header_block.decode('utf-8', errors='replace'))
+        }
 
         return method, path, headers, body
 
     except Exception as e:
-        logger.error(f"Error parsing LLM request: {e}")
+        logger.error("Error parsing LLM request: %s", e)
         return None, None, None, None
 
 
@@ -210,7 +208,7 @@ async def _forward_to_google(method, path, headers, body, config):
             masked_key = f"***{api_key[-4:]}" if api_key and len(api_key) > 4 else "***"
 
             # Log which config we're using
-            logger.info(f"Using config #{config.get_current_index() + 1}/{max_retries}: model={model}")
+            logger.info("Using config #%d/%d: model=%s", config.get_current_index() + 1, max_retries, model)
 
             # Build full URL
             url = f"{api_base}{path}"
@@ -227,52 +225,52 @@ async def _forward_to_google(method, path, headers, body, config):
                 'User-Agent': headers.get('User-Agent', 'Python-Proxy/1.0')
             }
 
-            # Make asynchronous request with httpx
-            async with httpx.AsyncClient(timeout=60.0) as client:
-                if method == 'POST':
-                    response = await client.post(url, content=body, headers=request_headers)
-                elif method == 'GET':
-                    response = await client.get(url, headers=request_headers)
-                else:
-                    logger.warning(f"Unsupported method: {method}")
-                    return None
-
-                # Check if request was successful
-                if response.status_code == 200:
-                    # Success - update status to healthy
-                    config.update_status(status='healthy', error_message=None)
-
-                    # Track successful request
-                    track_request(config.get_current_index(), success=True)
-
-                    logger.info(f"Response: {response.status_code} - {len(response.content)} bytes")
-                    response_data = _build_http_response(
-                        response.status_code,
-                        response.reason_phrase,
-                        response.headers,
-                        response.content
-                    )
-                    return response_data
-
-                # Any non-200 response - retry with next config
-                logger.warning(f"Config #{config.get_current_index() + 1} failed with status {response.status_code}")
-
-                # Update status based on error code
-                if response.status_code == 429:
-                    config.update_status(status='rate_limited', error_message=f"Rate limited: {response.status_code}")
-                elif response.status_code >= 500:
-                    config.update_status(status='server_error', error_message=f"Server error: {response.status_code}")
-                else:
-                    config.update_status(status='failed', error_message=f"API error: {response.status_code}")
-
-                # Track failed request
-                track_request(config.get_current_index(), success=False)
+            # Make asynchronous request with the shared httpx client (keeps upstream connections alive)
+            client = _get_http_client()
+            if method == 'POST':
+                response = await client.post(url, content=body, headers=request_headers)
+            elif method == 'GET':
+                response = await client.get(url, headers=request_headers)
+            else:
+                logger.warning("Unsupported method: %s", method)
+                return None
+
+            # Check if request was successful
+            if response.status_code == 200:
+                # Success - update status to healthy
+                config.update_status(status='healthy', error_message=None)
+
+                # Track successful request
+                track_request(config.get_current_index(), success=True)
+
+                logger.info("Response: %d - %d bytes", response.status_code, len(response.content))
+                response_data = _build_http_response(
+                    response.status_code,
+                    response.reason_phrase,
+                    response.headers,
+                    response.content
+                )
+                return response_data
+
+            # Any non-200 response - retry with next config
+            logger.warning("Config #%d failed with status %d", config.get_current_index() + 1, response.status_code)
 
-                # Raise exception to trigger retry with next config
-                raise Exception(f"API error: {response.status_code}")
+            # Update status based on error code
+            if response.status_code == 429:
+                config.update_status(status='rate_limited', error_message=f"Rate limited: {response.status_code}")
+            elif response.status_code >= 500:
+                config.update_status(status='server_error', error_message=f"Server error: {response.status_code}")
+            else:
+                config.update_status(status='failed', error_message=f"API error: {response.status_code}")
+
+            # Track failed request
+            track_request(config.get_current_index(), success=False)
+
+            # Raise exception to trigger retry with next config
+            raise Exception(f"API error: {response.status_code}")
 
         except Exception as e:
-            logger.warning(f"Error with config #{config.get_current_index() + 1}: {e}")
+            logger.warning("Error with config #%d: %s", config.get_current_index() + 1, e)
 
             # Update status based on exception type
             error_str = str(e).lower()
@@ -294,7 +292,7 @@ async def _forward_to_google(method, path, headers, body, config):
             # Check if we've tried all configs
             if retry_count >= max_retries:
                 # We've tried all configs
-                logger.error(f"All {max_retries} config(s) failed")
+                logger.error("All %d config(s) failed", max_retries)
 
                 # Return a 400 error to prevent client auto-retry
                 error_response = _create_error_response(
@@ -306,7 +304,7 @@ async def _forward_to_google(method, path, headers, body, config):
 
             # Move to next config
             config.current_index = (config.current_index + 1) % max_retries
-            logger.info(f"Failover to config #{config.get_current_index() + 1}")
+            logger.info("Failover to config #%d", config.get_current_index() + 1)
             # Continue loop with new config
 
     # Should not reach here, but just in case
@@ -319,6 +317,39 @@ async def _forward_to_google(method, path, headers, body, config):
     return error_response
 
 
+def _get_http_client():
+    """
+    Get or create the shared upstream HTTP client.
+
+    Returns:
+        httpx.AsyncClient: The shared client instance
+    """
+    global _http_client
+
+    if _http_client is None or _http_client.is_closed:
+        # Import httpx here to avoid requiring it if Gemini is disabled
+        import httpx
+
+        _http_client = httpx.AsyncClient(
+            timeout=UPSTREAM_TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=UPSTREAM_MAX_CONNECTIONS,
+                max_keepalive_connections=UPSTREAM_MAX_KEEPALIVE
+            )
+        )
+
+    return _http_client
+
+
+async def close_http_client():
+    """Close the shared upstream HTTP client, if it was created."""
+    global _http_client
+
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
 def _build_http_response(status_code, reason, headers, body):
     """
     Build a complete HTTP response.
@@ -333,25 +364,20 @@ def _build_http_response(status_code, reason, headers, body):
         bytes: Complete HTTP response
     """
     # Status line
-    response = f"HTTP/1.1 {status_code} {reason}\r\n".encode('utf-8')
+    head = [f"HTTP/1.1 {status_code} {reason}\r\n"]
 
     # Headers
     for key, value in headers.items():
         # Skip certain headers that are not valid or already handled
-        if key.lower() in ['transfer-encoding', 'connection', 'content-encoding']:
+        if key.lower() in ('transfer-encoding', 'connection', 'content-encoding'):
             continue
-        response += f"{key}: {value}\r\n".encode('utf-8')
-
-    # Add connection close header
-    response += b"Connection: close\r\n"
+        head.append(f"{key}: {value}\r\n")
 
-    # End of headers
-    response += b"\r\n"
+    # Add connection close header and end of headers
+    head.append("Connection: close\r\n\r\n")
 
-    # Body
-    response += body
-
-    return response
+    # Join once; the body is copied a single time
+    return "".join(head).encode('utf-8') + body
 
 
 def _create_error_response(status_code, reason, message):
@@ -147,6 +147,33 @@ def get_today_usage(config_index):
     return {"success": 0, "failed": 0, "total": 0}
 
 
+def get_today_usage_bulk(config_indices):
+    """
+    Get today's usage for several configs with a single history read.
+
+    Args:
+        config_indices (iterable): Indices of the configs (0-based)
+
+    Returns:
+        dict: Today's usage stats keyed by config index
+            {
+                0: {"success": 123, "failed": 5, "total": 128},
+                1: {"success": 0, "failed": 0, "total": 0},
+                ...
+            }
+            Configs without data for today get zeros
+    """
+    history = load_history()
+    today = get_today_date()
+
+    result = {}
+    for config_index in config_indices:
+        config_history = history.get(f"config_{config_index}", {})
+        result[config_index] = config_history.get(today, {"success": 0, "failed": 0, "total": 0})
+
+    return result
+
+
 def get_usage_range(config_index, days=30):
     """
     Get usage data for the last N days for a specific config.
@@ -170,13 +197,54 @@ def get_usage_range(config_index, days=30):
     if config_key not in history:
         return {}
 
+    return _filter_usage_range(history[config_key], days)
+
+
+def get_usage_range_bulk(config_indices, days=30):
+    """
+    Get usage data for the last N days for several configs with a single history read.
+
+    Args:
+        config_indices (iterable): Indices of the configs (0-based)
+        days (int): Number of days to retrieve (default: 30)
+
+    Returns:
+        dict: Usage data per config index, in the same format as get_usage_range
+            {
+                0: {"2025-01-15": {"success": 123, "failed": 5, "total": 128}, ...},
+                1: {},
+                ...
+            }
+            Configs without history get an empty dict
+    """
+    history = load_history()
+
+    result = {}
+    for config_index in config_indices:
+        config_history = history.get(f"config_{config_index}")
+        result[config_index] = _filter_usage_range(config_history, days) if config_history else {}
+
+    return result
+
+
+def _filter_usage_range(config_history, days):
+    """
+    Keep the entries of the last N days from a config's history.
+
+    Args:
+        config_history (dict): Usage data of one config keyed by date string
+        days (int): Number of days to keep
+
+    Returns:
+        dict: Usage data in range, sorted by date (oldest to newest)
+    """
     # Calculate date range
     today = datetime.now()
     start_date = today - timedelta(days=days-1)
 
     # Filter dates in range
     result = {}
-    for date_str, usage in history[config_key].items():
+    for date_str, usage in config_history.items():
         try:
             date_obj = datetime.strptime(date_str, '%Y-%m-%d')
             if start_date <= date_obj <= today:
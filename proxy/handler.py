@@ -14,7 +14,7 @@ from proxy.request_stats import get_request_stats_sync
 logger = get_logger()
 
 # Constants
-BUFFER_SIZE = 8192
+BUFFER_SIZE = 64 * 1024  # bytes per read (fewer reads for large request bodies)
 READ_TIMEOUT = 5  # seconds
 
 
@@ -36,7 +36,7 @@ async def handle_client(reader, writer):
         request_data = await _receive_request(reader)
 
         if not request_data:
-            logger.warning(f"Empty request from {ip_address}")
+            logger.warning("Empty request from %s", ip_address)
             await _close_connection(writer)
             return
 
@@ -46,18 +46,18 @@ async def handle_client(reader, writer):
             success = await handle_gemini_request(writer, request_data, client_address)
         else:
             # Non-Gemini request: close connection silently
-            logger.info(f"Non-Gemini request from {ip_address}, closing connection silently")
+            logger.info("Non-Gemini request from %s, closing connection silently", ip_address)
             await _close_connection(writer)
             return
 
     except asyncio.TimeoutError:
-        logger.warning(f"Client connection timed out: {ip_address}")
+        logger.warning("Client connection timed out: %s", ip_address)
         success = False
     except ConnectionResetError:
-        logger.warning(f"Client connection reset: {ip_address}")
+        logger.warning("Client connection reset: %s", ip_address)
         success = False
     except Exception as e:
-        logger.error(f"Error handling client request: {e}")
+        logger.error("Error handling client request: %s", e)
         success = False
 
     finally:
@@ -67,7 +67,7 @@ async def handle_client(reader, writer):
             try:
                 await stats.track_request(ip_address, request_type, success)
             except Exception as e:
-                logger.debug(f"Error tracking request stats: {e}")
+                logger.debug("Error tracking request stats: %s", e)
 
         await _close_connection(writer)
 
@@ -83,7 +83,8 @@ async def _receive_request(reader):
         bytes: The complete HTTP request
     """
     try:
-        request_data = b''
+        # Accumulate in a bytearray (extended in place, not re-copied per chunk)
+        request_data = bytearray()
         timeout_count = 0
         max_timeouts = 3  # Maximum number of consecutive timeouts before giving up
 
@@ -96,7 +97,7 @@ async def _receive_request(reader):
 
                 # Reset timeout counter on successful data reception
                 timeout_count = 0
-                request_data += data
+                request_data.extend(data)
 
                 # Check if we've received a complete HTTP request
                 if b'\r\n\r\n' in request_data:
@@ -125,11 +126,11 @@ async def _receive_request(reader):
             except asyncio.TimeoutError:
                 # Increment timeout counter
                 timeout_count += 1
-                logger.debug(f"Socket read timeout ({timeout_count}/{max_timeouts})")
+                logger.debug("Socket read timeout (%d/%d)", timeout_count, max_timeouts)
 
                 # If we've hit max timeouts, abort reception
                 if timeout_count >= max_timeouts:
-                    logger.warning(f"Maximum read timeouts reached, aborting request reception")
+                    logger.warning("Maximum read timeouts reached, aborting request reception")
                     break
 
                 # If we have partial headers, check if they might be complete
@@ -140,13 +141,13 @@ async def _receive_request(reader):
                 # Continue trying to receive data
                 continue
 
-        return request_data
+        return bytes(request_data)
 
     except asyncio.TimeoutError:
-        logger.warning(f"Timeout receiving request")
+        logger.warning("Timeout receiving request")
         return None
     except Exception as e:
-        logger.error(f"Error receiving request: {e}")
+        logger.error("Error receiving request: %s", e)
         return None
 
 
@@ -156,4 +157,4 @@ async def _close_connection(writer):
         writer.close()
         await writer.wait_closed()
     except Exception as e:
-        logger.error(f"Error closing connection: {e}") 
\ No newline at end of file
+        logger.error("Error closing connection: %s", e) 
\ No newline at end of file
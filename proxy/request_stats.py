@@ -5,12 +5,70 @@ This module tracks and stores statistics about incoming requests per IP address.
 """
 
 import asyncio
+import heapq
 import json
 import os
+import time
 from datetime import datetime
 from pathlib import Path
 from collections import defaultdict
 
+import orjson
+
+# Number of buffered requests that triggers folding them into the stats
+PENDING_FLUSH_SIZE = 1000
+
+
+class IpStats:
+    """
+    Statistics record for a single IP address.
+
+    Uses __slots__ instead of a per-IP dict to keep memory low when many IPs are tracked.
+    """
+
+    __slots__ = (
+        'total_requests',
+        'gemini_requests',
+        'success_count',
+        'failed_count',
+        'first_seen',
+        'last_seen'
+    )
+
+    def __init__(self):
+        self.total_requests = 0
+        self.gemini_requests = 0
+        self.success_count = 0
+        self.failed_count = 0
+        self.first_seen = None
+        self.last_seen = None
+
+    def to_dict(self):
+        """
+        Convert the record to a plain dict (the stats file format).
+
+        Returns:
+            dict: Statistics data
+        """
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Create a record from a stats file entry.
+
+        Args:
+            data (dict): Statistics data (unknown keys are ignored)
+
+        Returns:
+            IpStats: The loaded record
+        """
+        record = cls()
+        for name in cls.__slots__:
+            if name in data:
+                setattr(record, name, data[name])
+        return record
+
 
 class RequestStats:
     """
@@ -35,18 +93,15 @@ class RequestStats:
         self.auto_save_interval = auto_save_interval
         self.stats_file = None
 
-        # In-memory stats storage
-        self.stats = defaultdict(lambda: {
-            'total_requests': 0,
-            'gemini_requests': 0,
-            'first_seen': None,
-            'last_seen': None,
-            'success_count': 0,
-            'failed_count': 0
-        })
+        # In-memory stats storage: ip -> IpStats
+        self.stats = defaultdict(IpStats)
+
+        # Requests not yet folded into stats: (ip, success, timestamp)
+        self._pending = []
 
         # Thread safety
         self._lock = asyncio.Lock()
+        self._save_lock = asyncio.Lock()
         self._auto_save_task = None
         self._enabled = False
 
@@ -86,6 +141,9 @@ class RequestStats:
         """
         Track a single request.
 
+        Requests are buffered and folded into the per-IP stats in batches
+        (when the buffer fills up, or before stats are read or saved).
+
         Args:
             ip_address (str): Client IP address
             request_type (str): Type of request ('gemini' only)
@@ -94,26 +152,44 @@ class RequestStats:
         if not self._enabled:
             return
 
-        async with self._lock:
-            now = datetime.now().isoformat()
+        self._pending.append((ip_address, success, time.time()))
 
-            # Update stats
-            ip_stats = self.stats[ip_address]
-            ip_stats['total_requests'] += 1
+        if len(self._pending) >= PENDING_FLUSH_SIZE:
+            self._apply_pending()
 
-            # Track request type (all requests are Gemini now)
-            ip_stats['gemini_requests'] += 1
+    def _apply_pending(self):
+        """Fold buffered requests into the per-IP stats."""
+        if not self._pending:
+            return
+
+        pending = self._pending
+        self._pending = []
 
-            # Track success/failure
+        # Aggregate per IP first: [success, failed, first_timestamp, last_timestamp]
+        batch = {}
+        for ip_address, success, timestamp in pending:
+            entry = batch.get(ip_address)
+            if entry is None:
+                entry = batch[ip_address] = [0, 0, timestamp, timestamp]
             if success:
-                ip_stats['success_count'] += 1
+                entry[0] += 1
             else:
-                ip_stats['failed_count'] += 1
+                entry[1] += 1
+            entry[3] = timestamp
+
+        for ip_address, (success_count, failed_count, first_ts, last_ts) in batch.items():
+            # Update stats (all requests are Gemini now)
+            ip_stats = self.stats[ip_address]
+            total = success_count + failed_count
+            ip_stats.total_requests += total
+            ip_stats.gemini_requests += total
+            ip_stats.success_count += success_count
+            ip_stats.failed_count += failed_count
 
             # Update timestamps
-            if ip_stats['first_seen'] is None:
-                ip_stats['first_seen'] = now
-            ip_stats['last_seen'] = now
+            if ip_stats.first_seen is None:
+                ip_stats.first_seen = datetime.fromtimestamp(first_ts).isoformat()
+            ip_stats.last_seen = datetime.fromtimestamp(last_ts).isoformat()
 
     async def get_stats(self, ip_address=None):
         """
@@ -126,10 +202,12 @@ class RequestStats:
             dict: Statistics data
         """
         async with self._lock:
+            self._apply_pending()
             if ip_address:
-                return dict(self.stats.get(ip_address, {}))
+                ip_stats = self.stats.get(ip_address)
+                return ip_stats.to_dict() if ip_stats else {}
             else:
-                return {ip: dict(stats) for ip, stats in self.stats.items()}
+                return {ip: stats.to_dict() for ip, stats in self.stats.items()}
 
     async def get_top_ips(self, limit=10):
         """
@@ -142,12 +220,13 @@ class RequestStats:
             list: List of (ip, stats) tuples sorted by total_requests
         """
         async with self._lock:
-            sorted_ips = sorted(
+            self._apply_pending()
+            top_ips = heapq.nlargest(
+                limit,
                 self.stats.items(),
-                key=lambda x: x[1]['total_requests'],
-                reverse=True
+                key=lambda x: x[1].total_requests
             )
-            return [(ip, dict(stats)) for ip, stats in sorted_ips[:limit]]
+            return [(ip, stats.to_dict()) for ip, stats in top_ips]
 
     async def save_to_file(self, file_path=None):
         """
@@ -166,20 +245,29 @@ class RequestStats:
 
         try:
             async with self._lock:
-                # Convert defaultdict to regular dict for JSON serialization
-                stats_dict = {ip: dict(stats) for ip, stats in self.stats.items()}
-
-                # Add metadata
-                output = {
-                    'generated_at': datetime.now().isoformat(),
-                    'total_ips': len(stats_dict),
-                    'total_requests': sum(s['total_requests'] for s in stats_dict.values()),
-                    'stats': stats_dict
-                }
-
-                # Write to file
-                with open(save_path, 'w', encoding='utf-8') as f:
-                    json.dump(output, f, indent=2, ensure_ascii=False)
+                # Snapshot under the lock (plain dict per IP record); serializing
+                # and writing happen off the event loop below
+                self._apply_pending()
+                stats_dict = {ip: stats.to_dict() for ip, stats in self.stats.items()}
+
+            # Add metadata
+            output = {
+                'generated_at': datetime.now().isoformat(),
+                'total_ips': len(stats_dict),
+                'total_requests': sum(s['total_requests'] for s in stats_dict.values()),
+                'stats': stats_dict
+            }
+
+            # Only one write to the stats file at a time
+            async with self._save_lock:
+                write = asyncio.ensure_future(asyncio.to_thread(self._write_file, save_path, output))
+                try:
+                    await asyncio.shield(write)
+                except asyncio.CancelledError:
+                    # The worker thread cannot be cancelled; hold the lock until it
+                    # has finished with the temp file so the next save can't race it
+                    await write
+                    raise
 
             return True
         except Exception as e:
@@ -192,6 +280,23 @@ class RequestStats:
                 print(f"Error saving request stats: {e}")
             return False
 
+    @staticmethod
+    def _write_file(save_path, output):
+        """
+        Serialize stats and write them atomically (temp file + rename).
+
+        Runs in a worker thread so large stats do not block the event loop.
+
+        Args:
+            save_path (str): Destination file path
+            output (dict): Data to write
+        """
+        data = orjson.dumps(output, option=orjson.OPT_INDENT_2)
+        tmp_path = f"{save_path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, save_path)
+
     async def _load_from_file(self):
         """Load statistics from file if it exists."""
         if not self.stats_file or not Path(self.stats_file).exists():
@@ -209,7 +314,7 @@ class RequestStats:
                     # Skip metadata keys
                     if ip in ['generated_at', 'total_ips', 'total_requests']:
                         continue
-                    self.stats[ip] = ip_stats
+                    self.stats[ip] = IpStats.from_dict(ip_stats)
 
             # Log success if logger available
             try:
@@ -6,6 +6,7 @@ This module creates an async TCP server and handles incoming connections.
 
 import asyncio
 import signal
+import socket
 import sys
 
 from proxy.logger import get_logger
@@ -29,6 +30,7 @@ class ProxyServer:
         self.host = config.host
         self.port = config.port
         self.max_connections = config.max_connections
+        self.tcp_nodelay = config.tcp_nodelay
         self.server = None
         self.running = False
         self.connection_count = 0
@@ -69,12 +71,15 @@ class ProxyServer:
 
     async def _handle_connection(self, reader, writer):
         """Handle a new client connection."""
+        if self.tcp_nodelay:
+            self._set_low_latency(writer)
+
         self.connection_count += 1
         current_count = self.connection_count
 
         # Only log if count changed
         if self._last_connection_count != current_count:
-            logger.debug(f"Active connections: {current_count}")
+            logger.debug("Active connections: %d", current_count)
             self._last_connection_count = current_count
 
         try:
@@ -82,6 +87,26 @@ class ProxyServer:
         finally:
             self.connection_count -= 1
 
+    def _set_low_latency(self, writer):
+        """
+        Disable Nagle's algorithm (and delayed ACKs where supported) on a client socket.
+
+        Args:
+            writer (asyncio.StreamWriter): The client stream writer
+        """
+        sock = writer.get_extra_info('socket')
+        if sock is None:
+            return
+
+        try:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            # Linux only; the kernel may clear it again, but each connection
+            # only carries a single request/response exchange
+            if hasattr(socket, 'TCP_QUICKACK'):
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_QUICKACK, 1)
+        except OSError as e:
+            logger.debug("Could not set TCP options on client socket: %s", e)
+
     async def stop(self):
         """Stop the proxy server."""
         logger.info("Stopping proxy server...")